@@ -2,15 +2,16 @@
 """Command-line script to run all spanner experiments."""
 
 import argparse
-import math
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.evaluation.experiments import run_experiment_suite
+from src.evaluation.experiments import max_k_values, run_experiment_suite, validate_k_values
 
 
 def main():
@@ -22,7 +23,14 @@ def main():
         '--output',
         type=str,
         default=None,
-        help='Output CSV path. If not specified, generates timestamped filename: experiments-results-DD-MM-YYYY-HH-MM-SS.csv'
+        help='Output path (.csv or .parquet). If not specified, generates timestamped filename: experiments-results-DD-MM-YYYY-HH-MM-SS.<format>'
+    )
+    parser.add_argument(
+        '--format',
+        type=str,
+        choices=['csv', 'parquet'],
+        default=None,
+        help='Results file format (default: from the --output extension, else csv). Parquet requires pyarrow'
     )
     parser.add_argument(
         '--reps',
@@ -63,6 +71,12 @@ def main():
         default=1000,
         help='Number of vertex pairs to sample for stretch computation. Each sample requires BFS in both original graph and spanner, so reducing this speeds up experiments. Default: 1000'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes running experiments in parallel. Use 1 to run in the current process. Default: number of CPUs'
+    )
     
     args = parser.parse_args()
     
@@ -79,7 +93,7 @@ def main():
     if args.k_values is None:
         # Compute default k values: use k values that work for all n values
         # Find minimum max_k across all n values
-        min_max_k = min(int(math.log(n)) for n in n_values)
+        min_max_k = int(max_k_values(n_values).min())
         # Ensure at least k=2 is available
         if min_max_k < 2:
             raise ValueError(f"Cannot compute valid k values. min_max_k={min_max_k} < 2")
@@ -88,32 +102,18 @@ def main():
     else:
         k_values = args.k_values
     
-    # Validate k values
-    for k in k_values:
-        if not isinstance(k, int) or k < 2:
-            raise ValueError(f"k values must be integers >= 2, got k={k}")
-    
-    # Validate k values against all n values: k must be <= log(n) for each n
-    for n in n_values:
-        max_k = int(math.log(n))
-        invalid_ks = [k for k in k_values if k > max_k]
-        if invalid_ks:
-            raise ValueError(f"k values {invalid_ks} are invalid for n={n}. k must be <= log({n}) = {max_k}")
+    # Validate k values: integers >= 2 and k <= log(n) for each n
+    validate_k_values(n_values, k_values)
     
     if args.p_values is None:
-        # Default p values: log(n)/n, n^(-1/2), 0.1, 0.2, 0.3
-        # We'll compute these per n value
-        p_values = []
-        for n in n_values:
-            p_vals_for_n = [
-                math.log(n) / n if n > 1 else 0.1,
-                n ** (-0.5),
-                0.1,
-                0.2,
-                0.3
-            ]
-            p_values.extend(p_vals_for_n)
-        p_values = sorted(list(set(p_values)))  # Remove duplicates and sort
+        # Default p values: log(n)/n, n^(-1/2) for each n value, plus 0.1, 0.2, 0.3
+        # (np.unique removes duplicates and sorts; n > 100 is validated above)
+        n_arr = np.asarray(n_values, dtype=np.float64)
+        p_values = np.unique(np.concatenate([
+            np.log(n_arr) / n_arr,
+            n_arr ** -0.5,
+            np.array([0.1, 0.2, 0.3])
+        ])).tolist()
     else:
         p_values = args.p_values
     
@@ -122,7 +122,7 @@ def main():
         timestamp = datetime.now().strftime("%d-%m-%Y-%H-%M-%S")
         output_dir = Path("data/processed")
         output_dir.mkdir(parents=True, exist_ok=True)
-        args.output = str(output_dir / f"experiments-results-{timestamp}.csv")
+        args.output = str(output_dir / f"experiments-results-{timestamp}.{args.format or 'csv'}")
     
     print("=" * 60)
     print("Baswana-Sen Spanner Experiments")
@@ -133,6 +133,7 @@ def main():
     print(f"Repetitions: {args.reps}")
     print(f"Base seed: {args.seed}")
     print(f"Stretch samples: {args.stretch_samples}")
+    print(f"Workers: {args.workers or 'all CPUs'}")
     print(f"Output: {args.output}")
     print("=" * 60)
     
@@ -144,7 +145,9 @@ def main():
         n_reps=args.reps,
         base_seed=args.seed,
         n_stretch_samples=args.stretch_samples,
-        output_path=args.output
+        output_path=args.output,
+        n_workers=args.workers,
+        output_format=args.format
     )
     
     print(f"\nCompleted {len(df)} experiments.")
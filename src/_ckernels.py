@@ -0,0 +1,457 @@
+"""Compiled graph kernels over CSR arrays.
+
+Kernels are compiled with Numba when it is installed. Without Numba the same
+functions run as plain Python, which gives identical results but is much slower.
+
+Compiled kernels split their sources or queries across threads with prange and
+release the GIL, so they can also be called concurrently from Python threads.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange, set_num_threads
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    def set_num_threads(n):
+        """Fallback for numba.set_num_threads; plain Python kernels are single-threaded."""
+
+
+def limit_kernel_threads(n_threads: int) -> None:
+    """Cap the threads used by parallel kernels in this process (no-op without Numba)."""
+    set_num_threads(n_threads)
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def bfs_multi(indptr, indices, sources, n):
+    """
+    BFS distances from each source vertex, one source per thread.
+
+    Args:
+        indptr, indices: CSR arrays of the graph
+        sources: Source vertices, shape (s,)
+        n: Number of vertices
+
+    Returns:
+        int32 matrix of shape (s, n); entry [i, v] is d(sources[i], v), or -1 if unreachable
+    """
+    dist = np.full((len(sources), n), -1, dtype=np.int32)
+    for row in prange(len(sources)):
+        d = dist[row]
+        queue = np.empty(n, dtype=np.int32)
+        source = sources[row]
+        d[source] = 0
+        queue[0] = source
+        head = 0
+        tail = 1
+        while head < tail:
+            u = queue[head]
+            head += 1
+            for i in range(indptr[u], indptr[u + 1]):
+                v = indices[i]
+                if d[v] < 0:
+                    d[v] = d[u] + 1
+                    queue[tail] = v
+                    tail += 1
+    return dist
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def bfs_all_pairs(indptr, indices, dist, unreachable):
+    """
+    All-pairs BFS distances, one source per thread.
+    
+    Args:
+        indptr, indices: CSR arrays of the graph
+        dist: Output matrix of shape (n, n), filled with unreachable on entry
+        unreachable: Sentinel value marking unvisited vertices
+    """
+    n = dist.shape[0]
+    for source in prange(n):
+        d = dist[source]
+        queue = np.empty(n, dtype=np.int32)
+        d[source] = 0
+        queue[0] = source
+        head = 0
+        tail = 1
+        while head < tail:
+            u = queue[head]
+            head += 1
+            for i in range(indptr[u], indptr[u + 1]):
+                v = indices[i]
+                if d[v] == unreachable:
+                    d[v] = d[u] + 1
+                    queue[tail] = v
+                    tail += 1
+
+
+
+@njit(cache=True, nogil=True)
+def _bfs_bitparallel_group(indptr, indices, sources, dist, n):
+    """Fill dist (len(sources) <= 64 rows) from one bit-parallel traversal."""
+    zero = np.uint64(0)
+    one = np.uint64(1)
+    seen = np.zeros(n, dtype=np.uint64)
+    frontier = np.zeros(n, dtype=np.uint64)
+    next_frontier = np.zeros(n, dtype=np.uint64)
+    for i in range(len(sources)):
+        bit = one << np.uint64(i)
+        seen[sources[i]] |= bit
+        frontier[sources[i]] |= bit
+        dist[i, sources[i]] = 0
+    
+    level = 0
+    active = True
+    while active:
+        level += 1
+        active = False
+        for v in range(n):
+            bits = frontier[v]
+            if bits == zero:
+                continue
+            for j in range(indptr[v], indptr[v + 1]):
+                w = indices[j]
+                new = bits & ~seen[w]
+                if new != zero:
+                    seen[w] |= new
+                    next_frontier[w] |= new
+                    active = True
+        
+        # Record the level for every (source, vertex) first reached in this pass,
+        # and make the next frontier current
+        for w in range(n):
+            bits = next_frontier[w]
+            frontier[w] = bits
+            next_frontier[w] = zero
+            i = 0
+            while bits != zero:
+                if bits & one:
+                    dist[i, w] = level
+                bits >>= one
+                i += 1
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def bfs_bitparallel(indptr, indices, sources, n):
+    """
+    BFS distances from each source vertex, 64 sources per pass.
+    
+    Each group of up to 64 sources shares one level-synchronous traversal: bit i of
+    seen[v] / frontier[v] means source i of the group has reached v / reached it at
+    the current level, so an edge is scanned once per level for the whole group
+    instead of once per source. Groups run one per thread.
+    
+    Args:
+        indptr, indices: CSR arrays of the graph
+        sources: Source vertices, shape (s,)
+        n: Number of vertices
+    
+    Returns:
+        int32 matrix of shape (s, n); entry [i, v] is d(sources[i], v), or -1 if unreachable
+    """
+    dist = np.full((len(sources), n), -1, dtype=np.int32)
+    for group in prange((len(sources) + 63) // 64):
+        first = group * 64
+        last = min(first + 64, len(sources))
+        _bfs_bitparallel_group(indptr, indices, sources[first:last], dist[first:last], n)
+    return dist
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def bfs_to_targets(indptr, indices, sources, targets, n, cutoff):
+    """
+    BFS distance d(sources[i], targets[i]) per query, stopping each search early.
+    
+    A search ends as soon as its target is discovered, or once every remaining
+    vertex is more than cutoff levels away. Queries run in chunks of 64 per thread;
+    each chunk reuses one distance array and resets only the vertices it touched.
+    
+    Args:
+        indptr, indices: CSR arrays of the graph
+        sources, targets: Query endpoints, shape (q,)
+        n: Number of vertices
+        cutoff: Largest distance of interest (n or more for none)
+    
+    Returns:
+        int32 array of shape (q,); -1 where the target is unreachable within cutoff
+    """
+    n_queries = len(sources)
+    out = np.full(n_queries, -1, dtype=np.int32)
+    for chunk in prange((n_queries + 63) // 64):
+        dist = np.full(n, -1, dtype=np.int32)
+        queue = np.empty(n, dtype=np.int32)
+        for q in range(chunk * 64, min(chunk * 64 + 64, n_queries)):
+            source = sources[q]
+            target = targets[q]
+            if source == target:
+                out[q] = 0
+                continue
+            dist[source] = 0
+            queue[0] = source
+            head = 0
+            tail = 1
+            while head < tail and out[q] < 0:
+                u = queue[head]
+                head += 1
+                if dist[u] >= cutoff:
+                    break
+                for i in range(indptr[u], indptr[u + 1]):
+                    v = indices[i]
+                    if dist[v] < 0:
+                        if v == target:
+                            out[q] = dist[u] + 1
+                            break
+                        dist[v] = dist[u] + 1
+                        queue[tail] = v
+                        tail += 1
+            for i in range(tail):
+                dist[queue[i]] = -1
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _find_root(parent, v):
+    """Root of v in a union-find forest, compressing the path to it."""
+    root = v
+    while parent[root] != root:
+        root = parent[root]
+    while parent[v] != root:
+        next_v = parent[v]
+        parent[v] = root
+        v = next_v
+    return root
+
+
+@njit(cache=True, nogil=True)
+def component_roots(indptr, indices, n):
+    """
+    Connected components by union-find with path compression.
+    
+    Unions always link to the smaller root, so every component is labeled by its
+    smallest vertex.
+    
+    Args:
+        indptr, indices: CSR arrays of the graph
+        n: Number of vertices
+    
+    Returns:
+        int32 array of shape (n,); entry v is the smallest vertex in v's component
+    """
+    parent = np.arange(n, dtype=np.int32)
+    for u in range(n):
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if u < v:
+                a = _find_root(parent, u)
+                b = _find_root(parent, v)
+                if a < b:
+                    parent[b] = a
+                elif b < a:
+                    parent[a] = b
+    for v in range(n):
+        parent[v] = _find_root(parent, v)
+    return parent
+
+
+@njit(cache=True, nogil=True)
+def baswana_sen_phase(indptr, indices, member_ptr, members, cluster_of, sampled, order, edge_u, edge_v, in_spanner):
+    """
+    One Baswana-Sen phase: grow new clusters around the sampled ones, then mark
+    every edge between different new clusters as a spanner edge.
+    
+    The new cluster j is cluster order[j] plus every neighbor of its members whose
+    cluster is not sampled; a vertex next to several sampled clusters joins each
+    of them and takes the last id. Vertices left out become singletons, numbered
+    next in vertex order.
+    
+    Args:
+        indptr, indices: CSR arrays of the graph
+        member_ptr, members: Current clusters in CSR layout
+        cluster_of: Current cluster id of every vertex
+        sampled: Boolean mask over current cluster ids
+        order: Sampled cluster ids in the order they get new ids
+        edge_u, edge_v: Edges of the graph (u < v)
+        in_spanner: Boolean mask over the edges, updated in place
+    
+    Returns:
+        Tuple of (member_ptr, members, cluster_of) for the new clusters
+    """
+    n = len(cluster_of)
+    capacity = n
+    for j in range(len(order)):
+        for e in range(member_ptr[order[j]], member_ptr[order[j] + 1]):
+            u = members[e]
+            capacity += 1 + indptr[u + 1] - indptr[u]
+    new_ptr = np.empty(len(order) + n + 1, dtype=np.int64)
+    new_members = np.empty(capacity, dtype=np.int64)
+    new_cluster_of = np.full(n, -1, dtype=np.int64)
+    # mark[v] == j: v is already a member of new cluster j
+    mark = np.full(n, -1, dtype=np.int64)
+    # One flat pass resolving "v's cluster is not sampled", so the neighbor scan
+    # below does a single lookup per neighbor instead of cluster_of then sampled
+    joinable = np.empty(n, dtype=np.bool_)
+    for v in range(n):
+        joinable[v] = not sampled[cluster_of[v]]
+    
+    size = 0
+    new_ptr[0] = 0
+    for j in range(len(order)):
+        first = member_ptr[order[j]]
+        last = member_ptr[order[j] + 1]
+        for e in range(first, last):
+            u = members[e]
+            if mark[u] != j:
+                mark[u] = j
+                new_members[size] = u
+                size += 1
+                new_cluster_of[u] = j
+        for e in range(first, last):
+            u = members[e]
+            for i in range(indptr[u], indptr[u + 1]):
+                v = indices[i]
+                if joinable[v] and mark[v] != j:
+                    mark[v] = j
+                    new_members[size] = v
+                    size += 1
+                    new_cluster_of[v] = j
+        new_ptr[j + 1] = size
+    
+    n_clusters = len(order)
+    for v in range(n):
+        if new_cluster_of[v] < 0:
+            new_cluster_of[v] = n_clusters
+            new_members[size] = v
+            size += 1
+            n_clusters += 1
+            new_ptr[n_clusters] = size
+    
+    for e in range(len(edge_u)):
+        if new_cluster_of[edge_u[e]] != new_cluster_of[edge_v[e]]:
+            in_spanner[e] = True
+    return new_ptr[:n_clusters + 1], new_members[:size], new_cluster_of
+
+
+@njit(cache=True, nogil=True)
+def _greedy_dist_check(h_adj, h_deg, indptr, dist, queue, start, target, limit):
+    """
+    Bidirectional BFS distance from start to target in the partial spanner, or -1
+    if it exceeds limit. dist and queue are (2, n) scratch arrays; dist must be -1
+    everywhere on entry and is restored before returning.
+    """
+    lo = np.zeros(2, dtype=np.int64)
+    hi = np.ones(2, dtype=np.int64)
+    radius = np.zeros(2, dtype=np.int64)
+    queue[0, 0] = start
+    queue[1, 0] = target
+    dist[0, start] = 0
+    dist[1, target] = 0
+    
+    found = -1
+    # Any path found from here on has length >= radius[0] + radius[1] + 1
+    while found < 0 and lo[0] < hi[0] and lo[1] < hi[1] and radius[0] + radius[1] < limit:
+        # Expand one full level of the side with the smaller frontier
+        a = 0 if hi[0] - lo[0] <= hi[1] - lo[1] else 1
+        b = 1 - a
+        end = hi[a]
+        for q in range(lo[a], end):
+            u = queue[a, q]
+            for i in range(indptr[u], indptr[u] + h_deg[u]):
+                v = h_adj[i]
+                if dist[b, v] >= 0:
+                    # First meeting happens at the shortest distance
+                    found = radius[a] + 1 + dist[b, v]
+                    break
+                if dist[a, v] < 0:
+                    dist[a, v] = radius[a] + 1
+                    queue[a, hi[a]] = v
+                    hi[a] += 1
+            if found >= 0:
+                break
+        lo[a] = end
+        radius[a] += 1
+    
+    for side in range(2):
+        for q in range(hi[side]):
+            dist[side, queue[side, q]] = -1
+    return found
+
+
+@njit(cache=True, nogil=True)
+def greedy_spanner_edges(indptr, indices, edge_u, edge_v, limit):
+    """
+    Greedy spanner over the given edge order: keep edge (u, v) when the spanner
+    built so far has no u-v path of length <= limit.
+    
+    The partial spanner lives in per-vertex slots of the graph's own CSR layout
+    (H is a subgraph of G), so adding an edge is O(1).
+    
+    Args:
+        indptr, indices: CSR arrays of the graph
+        edge_u, edge_v: Edges of the graph in processing order
+        limit: Stretch limit 2k - 1
+    
+    Returns:
+        Boolean mask over the edges; True where the edge is in the spanner
+    """
+    n = len(indptr) - 1
+    h_adj = np.empty(len(indices), dtype=np.int32)
+    h_deg = np.zeros(n, dtype=np.int64)
+    dist = np.full((2, n), -1, dtype=np.int64)
+    queue = np.empty((2, n), dtype=np.int32)
+    keep = np.zeros(len(edge_u), dtype=np.bool_)
+    for e in range(len(edge_u)):
+        u = edge_u[e]
+        v = edge_v[e]
+        if u != v and _greedy_dist_check(h_adj, h_deg, indptr, dist, queue, u, v, limit) < 0:
+            h_adj[indptr[u] + h_deg[u]] = v
+            h_deg[u] += 1
+            h_adj[indptr[v] + h_deg[v]] = u
+            h_deg[v] += 1
+            keep[e] = True
+    return keep
+
+
+def warm_up() -> None:
+    """
+    Compile (or load from the on-disk cache) every kernel in this process.
+    
+    Numba compiles a kernel on its first call, per argument type signature, so the
+    first timed experiment in a process would otherwise include compilation. Each
+    kernel is called once on a 4-vertex path with the same argument dtypes the
+    graph, spanner and stretch code pass. No-op without Numba.
+    """
+    if not HAVE_NUMBA:
+        return
+    n = 4
+    # Path 0-1-2-3 in the CSRGraph layout: int32 offsets and neighbors
+    indptr = np.array([0, 1, 3, 5, 6], dtype=np.int32)
+    indices = np.array([1, 0, 2, 1, 3, 2], dtype=np.int32)
+    # Edges (u < v) as the spanner builders derive them from the CSR rows
+    edge_u = np.repeat(np.arange(n), np.diff(indptr))
+    is_upper = edge_u < indices
+    edge_u = edge_u[is_upper]
+    edge_v = indices[is_upper]
+    sources = np.array([0, 2], dtype=np.int32)
+    targets = np.array([3, 1], dtype=np.int32)
+    
+    bfs_multi(indptr, indices, sources, n)
+    for dtype in (np.uint16, np.int32):
+        unreachable = int(np.iinfo(dtype).max)
+        bfs_all_pairs(indptr, indices, np.full((n, n), unreachable, dtype=dtype), unreachable)
+    bfs_bitparallel(indptr, indices, sources, n)
+    bfs_to_targets(indptr, indices, sources, targets, n, n)
+    component_roots(indptr, indices, n)
+    baswana_sen_phase(
+        indptr, indices, np.arange(n + 1), np.arange(n), np.arange(n), np.array([True, False, True, False]),
+        np.flatnonzero([True, False, True, False]), edge_u, edge_v, np.zeros(len(edge_u), dtype=bool)
+    )
+    greedy_spanner_edges(indptr, indices, edge_u, edge_v, 3)
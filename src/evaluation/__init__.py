@@ -1,10 +1,12 @@
 """Evaluation and experiment utilities."""
 
 from .stretch import (
+    bfs_single_target,
     compute_distances_bfs,
     compute_all_pairs_distances,
     compute_stretch_edges,
-    compute_stretch_sampled_pairs
+    compute_stretch_sampled_pairs,
+    compute_stretch_both
 )
 from .experiments import (
     run_single_experiment,
@@ -13,10 +15,12 @@ from .experiments import (
 from .metrics import aggregate_results
 
 __all__ = [
+    'bfs_single_target',
     'compute_distances_bfs',
     'compute_all_pairs_distances',
     'compute_stretch_edges',
     'compute_stretch_sampled_pairs',
+    'compute_stretch_both',
     'run_single_experiment',
     'run_experiment_suite',
     'aggregate_results',
@@ -1,21 +1,147 @@
 """Experiment orchestration for spanner evaluation."""
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import csv
 from itertools import product
 import math
+import multiprocessing
 import os
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
+from .._ckernels import limit_kernel_threads, warm_up
+from ..graphs.csr import CSRGraph
 from ..graphs.erdos_renyi import generate_erdos_renyi_graph
 from ..spanners.baswana_sen import build_spanner_baswana_sen
-from .stretch import compute_stretch_sampled_edges, compute_stretch_sampled_pairs
+from .stretch import compute_stretch_both
 from .metrics import compute_theoretical_bound
 from ..utils.timing import Timer
 
 
+# Typed result row; field order is the column order of the results file
+RESULT_DTYPE = np.dtype([
+    ('n', 'i4'), ('p', 'f8'), ('k', 'i4'), ('rep', 'i4'), ('seed', 'i8'),
+    ('n_original', 'i4'), ('n_connected', 'i4'),
+    ('n_edges_G', 'i8'), ('spanner_size', 'i8'), ('theoretical_bound', 'f8'), ('spanner_size_ratio', 'f8'),
+    ('max_stretch_edges', 'f8'), ('avg_stretch_edges', 'f8'), ('max_stretch_pairs', 'f8'), ('avg_stretch_pairs', 'f8'),
+    ('time_gen', 'f8'), ('time_spanner', 'f8'), ('time_stretch', 'f8'),
+    ('n_infinite_stretch_edges', 'i4'), ('n_infinite_stretch_pairs', 'i4'),
+])
+RESULT_FIELDS = list(RESULT_DTYPE.names)
+# Columns also present on error rows; the rest are left blank (NaN) when an experiment fails
+_PARAMETER_FIELDS = ['n', 'p', 'k', 'rep', 'seed']
+
+
+class _CsvResultWriter:
+    """Appends result rows to a CSV file that stays open for the whole suite."""
+    
+    def __init__(self, path: str, flush_every: int = 32):
+        write_header = not os.path.exists(path)
+        self.path = path
+        # Data rows already in the file from earlier runs
+        self.rows_before = 0
+        if not write_header:
+            with open(path, newline='') as f:
+                self.rows_before = max(sum(1 for _ in csv.reader(f)) - 1, 0)
+        self._file = open(path, 'a', newline='')
+        # Error rows only carry the parameter columns; their message is not written
+        self._writer = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+        if write_header:
+            self._writer.writeheader()
+            self._file.flush()
+        self._flush_every = flush_every
+        self._unflushed = 0
+    
+    def write(self, row: Dict) -> None:
+        self._writer.writerow(row)
+        self._unflushed += 1
+        if self._unflushed >= self._flush_every:
+            self._file.flush()
+            self._unflushed = 0
+    
+    def close(self) -> None:
+        self._file.close()
+    
+    def read(self) -> pd.DataFrame:
+        """Load the rows written by this writer (earlier runs' rows are skipped)."""
+        return pd.read_csv(self.path, skiprows=range(1, self.rows_before + 1), float_precision='round_trip')
+
+
+class _ParquetResultWriter:
+    """
+    Appends result rows to a Parquet file in record batches of batch_size rows.
+    
+    The schema comes from RESULT_DTYPE; columns missing from a row (error rows) are
+    written as nulls. Parquet files cannot be appended to in place, so rows already
+    in the file are read once and rewritten ahead of the new ones. Everything goes
+    to path + '.tmp', which replaces path on close, so an interrupted run leaves the
+    previous file intact (losing only its own rows).
+    """
+    
+    def __init__(self, path: str, batch_size: int = 256):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from e
+        self._pa = pa
+        self.path = path
+        self._schema = pa.schema([(name, pa.from_numpy_dtype(RESULT_DTYPE[name])) for name in RESULT_FIELDS])
+        previous = pq.read_table(path).select(RESULT_FIELDS).cast(self._schema) if os.path.exists(path) else None
+        # Data rows already in the file from earlier runs
+        self.rows_before = previous.num_rows if previous is not None else 0
+        self._tmp_path = path + '.tmp'
+        self._writer = pq.ParquetWriter(self._tmp_path, self._schema)
+        if previous is not None:
+            self._writer.write_table(previous)
+        self._batch_size = batch_size
+        self._columns = {field: [] for field in RESULT_FIELDS}
+        self._buffered = 0
+    
+    def write(self, row: Dict) -> None:
+        for field, column in self._columns.items():
+            column.append(row.get(field))
+        self._buffered += 1
+        if self._buffered >= self._batch_size:
+            self._flush()
+    
+    def _flush(self) -> None:
+        if self._buffered == 0:
+            return
+        arrays = [self._pa.array(self._columns[field], type=self._schema.field(field).type) for field in RESULT_FIELDS]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+        for column in self._columns.values():
+            column.clear()
+        self._buffered = 0
+    
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+        # The new file is complete only now; swap it in atomically
+        os.replace(self._tmp_path, self.path)
+    
+    def read(self) -> pd.DataFrame:
+        """Load the rows written by this writer (earlier runs' rows are skipped)."""
+        return pd.read_parquet(self.path).iloc[self.rows_before:].reset_index(drop=True)
+
+
+_RESULT_WRITERS = {'csv': _CsvResultWriter, 'parquet': _ParquetResultWriter}
+
+
+def _output_format(output_path: str, output_format: Optional[str]) -> str:
+    """Resolve the results file format: explicit output_format, else the file extension (default csv)."""
+    if output_format is None:
+        output_format = 'parquet' if output_path.endswith('.parquet') else 'csv'
+    if output_format not in _RESULT_WRITERS:
+        raise ValueError(f"output_format must be one of {sorted(_RESULT_WRITERS)}, got {output_format!r}")
+    return output_format
+
+
 def timed(func: Callable) -> Tuple[Any, float]:
     """Helper to time a function call and return (result, elapsed_time)."""
     with Timer() as timer:
@@ -23,36 +149,72 @@ def timed(func: Callable) -> Tuple[Any, float]:
     return result, timer.elapsed
 
 
-def run_single_experiment(n: int, p: float, k: int, rep: int, base_seed: int, n_stretch_samples: int) -> Dict:
-    """Run a single experiment: generate graph, build spanner, compute metrics."""
-    # Validate k: must be integer >= 2 and <= log(n)
+def _experiment_seeds(seed: int) -> List[np.random.SeedSequence]:
+    """Independent (graph, spanner, stretch) seed streams spawned from one experiment seed."""
+    return np.random.SeedSequence(seed).spawn(3)
+
+
+def _validate_k(n: int, k: int) -> None:
+    """Raise ValueError unless k is an integer with 2 <= k <= log(n)."""
     if not isinstance(k, int) or k < 2:
         raise ValueError(f"k must be an integer >= 2, got k={k}")
     if n > 1:
         max_k = int(math.log(n))
         if k > max_k:
             raise ValueError(f"k={k} is invalid for n={n}. k must be <= log({n}) = {max_k}")
+
+
+def max_k_values(n_values: List[int]) -> np.ndarray:
+    """Largest valid k, floor(log(n)), for each n in n_values."""
+    return np.floor(np.log(np.asarray(n_values, dtype=np.float64))).astype(np.int64)
+
+
+def validate_k_values(n_values: List[int], k_values: List[int]) -> None:
+    """
+    Check every k against every n in one vectorized pass.
     
-    seed = base_seed + rep
+    Raises:
+        ValueError: If some k is not an integer >= 2, or k > log(n) for some n
+            (reported for the first such n)
+    """
+    for k in k_values:
+        if not isinstance(k, int) or k < 2:
+            raise ValueError(f"k values must be integers >= 2, got k={k}")
     
-    # Generate graph
-    (G, n_original, n_connected), time_gen = timed(lambda: generate_erdos_renyi_graph(n, p, seed))
-    n_edges_G = sum(len(neighbors) for neighbors in G.values()) // 2
+    max_ks = max_k_values(n_values)
+    # bad[i, j]: k_values[i] is too large for n_values[j]
+    bad = np.asarray(k_values, dtype=np.int64)[:, None] > max_ks[None, :]
+    bad_n = np.flatnonzero(bad.any(axis=0))
+    if len(bad_n) > 0:
+        j = bad_n[0]
+        n, max_k = n_values[j], int(max_ks[j])
+        invalid_ks = [k for k, is_bad in zip(k_values, bad[:, j]) if is_bad]
+        raise ValueError(f"k values {invalid_ks} are invalid for n={n}. k must be <= log({n}) = {max_k}")
+
+
+def _spanner_experiment(G: CSRGraph, n_original: int, n_connected: int, time_gen: float, n: int, p: float, k: int, rep: int, seed: int, spanner_seed: np.random.SeedSequence, stretch_seed: np.random.SeedSequence, n_stretch_samples: int) -> Dict:
+    """
+    Build a spanner of an already generated graph and compute its metrics.
+    
+    Generators are created from spanner_seed and stretch_seed here, so every k run on
+    the same graph sees the same random streams regardless of evaluation order. All
+    seeds are derived by the caller before any timer starts.
+    """
+    n_edges_G = G.n_edges
     
     # Build spanner
-    H, time_spanner = timed(lambda: build_spanner_baswana_sen(G, k, seed + 1000))
-    n_edges_H = sum(len(neighbors) for neighbors in H.values()) // 2
+    H, time_spanner = timed(lambda: build_spanner_baswana_sen(G, k, spanner_seed))
+    
+    # Compute stretch on sampled edges and sampled pairs (for performance, always use
+    # sampling instead of exact computation): early-exit BFS for the edges in H,
+    # batched BFS for the pairs in H and in G
+    (stretch_edges, stretch_pairs), time_stretch = timed(lambda: compute_stretch_both(G, H, n_stretch_samples, stretch_seed))
     
-    # Compute theoretical bound
+    # Size bookkeeping happens after both timed regions so it is not counted in either
+    n_edges_H = H.n_edges
     theoretical_bound = compute_theoretical_bound(n_connected, k)
     spanner_size_ratio = n_edges_H / theoretical_bound if theoretical_bound > 0 else 0.0
     
-    # Compute stretch on sampled edges (for performance, always use sampling instead of exact computation)
-    stretch_edges, time_stretch_edges = timed(lambda: compute_stretch_sampled_edges(G, H, n_stretch_samples, seed + 2000))
-    
-    # Compute stretch on sampled pairs
-    stretch_pairs, time_stretch_pairs = timed(lambda: compute_stretch_sampled_pairs(G, H, n_stretch_samples, seed + 2000))
-    
     return {
         'n': n, 'p': p, 'k': k, 'rep': rep, 'seed': seed,
         'n_original': n_original, 'n_connected': n_connected,
@@ -63,132 +225,223 @@ def run_single_experiment(n: int, p: float, k: int, rep: int, base_seed: int, n_
         'max_stretch_pairs': stretch_pairs['max_stretch'],
         'avg_stretch_pairs': stretch_pairs['avg_stretch'],
         'time_gen': time_gen, 'time_spanner': time_spanner,
-        'time_stretch': time_stretch_edges + time_stretch_pairs,
+        'time_stretch': time_stretch,
         'n_infinite_stretch_edges': stretch_edges.get('n_infinite', 0),
         'n_infinite_stretch_pairs': stretch_pairs.get('n_infinite', 0),
     }
 
 
-def run_experiment_suite(n_values: List[int], p_values: List[float], k_values: List[int], n_reps: int, base_seed: int, n_stretch_samples: int, output_path: Optional[str] = None) -> pd.DataFrame:
-    """Run a full suite of experiments over all parameter combinations. Saves results incrementally if output_path is provided."""
+def run_single_experiment(n: int, p: float, k: int, rep: int, base_seed: int, n_stretch_samples: int) -> Dict:
+    """Run a single experiment: generate graph, build spanner, compute metrics."""
+    _validate_k(n, k)
+    
+    seed = base_seed + rep
+    graph_seed, spanner_seed, stretch_seed = _experiment_seeds(seed)
+    
+    # Generate graph
+    (G, n_original, n_connected), time_gen = timed(lambda: generate_erdos_renyi_graph(n, p, graph_seed))
+    
+    return _spanner_experiment(G, n_original, n_connected, time_gen, n, p, k, rep, seed, spanner_seed, stretch_seed, n_stretch_samples)
+
+
+def _error_row(n: int, p: float, k: int, rep: int, base_seed: int, error: Exception) -> Dict:
+    """Result row for a failed experiment: parameter columns plus the error message."""
+    return {'n': n, 'p': p, 'k': k, 'rep': rep, 'seed': base_seed + rep, 'error': str(error)}
+
+
+def _run_graph_experiments(n: int, p: float, k_values: List[int], rep: int, base_seed: int, n_stretch_samples: int) -> List[Dict]:
+    """
+    Run one experiment per k on a single generated graph.
+    
+    The graph depends only on (n, p, base_seed + rep), so it is generated once and
+    its generation time is split evenly across the k values. A failure for one k
+    becomes an error row for that k only; if generation fails, every k does.
+    """
+    seed = base_seed + rep
+    graph_seed, spanner_seed, stretch_seed = _experiment_seeds(seed)
+    try:
+        (G, n_original, n_connected), time_gen = timed(lambda: generate_erdos_renyi_graph(n, p, graph_seed))
+    except Exception as e:
+        return [_error_row(n, p, k, rep, base_seed, e) for k in k_values]
+    time_gen_per_k = time_gen / len(k_values)
+    
+    results = []
+    for k in k_values:
+        try:
+            _validate_k(n, k)
+            results.append(_spanner_experiment(G, n_original, n_connected, time_gen_per_k, n, p, k, rep, seed, spanner_seed, stretch_seed, n_stretch_samples))
+        except Exception as e:
+            results.append(_error_row(n, p, k, rep, base_seed, e))
+    return results
+
+
+def _run_one(task: Tuple[int, float, Tuple[int, ...], int, int, int]) -> List[Dict]:
+    """Run one (n, p, k_values, rep, base_seed, n_stretch_samples) task; failures become error rows."""
+    n, p, k_values, rep, base_seed, n_stretch_samples = task
+    return _run_graph_experiments(n, p, k_values, rep, base_seed, n_stretch_samples)
+
+
+def _init_worker(n_threads: int) -> None:
+    """Pool initializer: cap kernel threads, then compile kernels before any task is timed."""
+    limit_kernel_threads(n_threads)
+    warm_up()
+
+
+@contextmanager
+def _task_results(tasks: List[Tuple], n_workers: int) -> Iterator[Iterator[List[Dict]]]:
+    """Yield an iterator over _run_one results in task order, using a process pool if n_workers > 1."""
+    if n_workers == 1:
+        # Compile kernels now, so the first experiment's timings exclude compilation
+        warm_up()
+        yield map(_run_one, tasks)
+        return
+    # Processes already use every core; threaded kernels inside them would oversubscribe.
+    # Workers are spawned, not forked: forking after the parent has run a parallel numba
+    # kernel leaves the parent hung at interpreter exit (workqueue threading layer)
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker, initargs=(1,)) as executor:
+        chunksize = max(1, len(tasks) // (8 * n_workers))
+        yield executor.map(_run_one, tasks, chunksize=chunksize)
+
+
+def run_experiment_suite(n_values: List[int], p_values: List[float], k_values: List[int], n_reps: int, base_seed: int, n_stretch_samples: int, output_path: Optional[str] = None, n_workers: Optional[int] = None, output_format: Optional[str] = None) -> pd.DataFrame:
+    """Run a full suite of experiments over all parameter combinations, saving results to output_path if provided.
+
+    CSV output is written incrementally: rows are appended as experiments finish and flushed
+    every 32 rows, so an interrupted run keeps all but its last few rows. Parquet output is
+    written to output_path + '.tmp' and replaces output_path only when the suite ends, so an
+    interrupted run leaves any existing file intact but saves none of its own rows.
+
+    Experiments run in n_workers processes (default: one per CPU; 1 runs in-process). Results are
+    collected in parameter order on the main process, which alone writes the output file. When
+    output_path is given, rows are not kept in memory and the returned DataFrame is read back from
+    the file; otherwise rows are stored in a preallocated RESULT_DTYPE array. Either way the
+    DataFrame gets an 'error' column if any experiment failed.
+
+    output_format is 'csv' or 'parquet' (requires pyarrow); by default it follows the extension
+    of output_path, falling back to CSV.
+    """
     # Validate n values: all must be > 100
     for n in n_values:
         if n <= 100:
             raise ValueError(f"All n values must be > 100, got n={n}")
     
     # Validate k values: must be integers >= 2 and <= log(n) for all n values
-    for k in k_values:
-        if not isinstance(k, int) or k < 2:
-            raise ValueError(f"k values must be integers >= 2, got k={k}")
-    for n in n_values:
-        max_k = int(math.log(n))
-        invalid_ks = [k for k in k_values if k > max_k]
-        if invalid_ks:
-            raise ValueError(f"k values {invalid_ks} are invalid for n={n}. k must be <= log({n}) = {max_k}")
+    validate_k_values(n_values, k_values)
     
-    results = []
+    error_rows = []  # (row position, message) of failed experiments
     total_experiments = len(n_values) * len(p_values) * len(k_values) * n_reps
     experiments_per_n = len(p_values) * len(k_values) * n_reps
     
     # Track average runtime per n value
     n_avg_times = {}  # n -> (total_time, count)
+    n_index = {n: i for i, n in enumerate(n_values)}
     prev_n = None
     prev_avg_time = None
     
-    # Initialize output file if path provided
+    # Open output file once if path provided, otherwise collect typed rows in memory
+    writer = None
+    rows = None
     if output_path:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        if not os.path.exists(output_path):
-            df_header = pd.DataFrame(columns=[
-                'n', 'p', 'k', 'rep', 'seed', 'n_original', 'n_connected',
-                'n_edges_G', 'spanner_size', 'theoretical_bound', 'spanner_size_ratio',
-                'max_stretch_edges', 'avg_stretch_edges', 'max_stretch_pairs', 'avg_stretch_pairs',
-                'time_gen', 'time_spanner', 'time_stretch',
-                'n_infinite_stretch_edges', 'n_infinite_stretch_pairs'
-            ])
-            df_header.to_csv(output_path, index=False)
-    
-    with tqdm(total=total_experiments, desc="Running experiments") as pbar:
-        current_n = None
-        experiments_in_current_n = 0
-        
-        for n, p, k, rep in product(n_values, p_values, k_values, range(n_reps)):
-            # Detect when we move to a new n value
-            if n != current_n:
-                current_n = n
-                experiments_in_current_n = 0
-                # Initialize with estimate from previous n if available
-                if prev_n is not None and prev_avg_time is not None:
-                    # O(n^2) scaling: time scales as (n2/n1)^2
-                    ratio = n / prev_n
-                    estimated_avg_time = (prev_avg_time * ratio) ** 2
-                    n_avg_times[n] = (estimated_avg_time, 1)  # Initialize with estimate
-                else:
-                    n_avg_times[n] = (0.0, 0)  # Will be updated after first experiment
-            
+        writer = _RESULT_WRITERS[_output_format(output_path, output_format)](output_path)
+    else:
+        rows = np.zeros(total_experiments, dtype=RESULT_DTYPE)
+    
+    # One task per graph; each runs every k on it
+    tasks = [(n, p, tuple(k_values), rep, base_seed, n_stretch_samples)
+             for n, p, rep in product(n_values, p_values, range(n_reps))]
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    
+    try:
+        with tqdm(total=total_experiments, desc="Running experiments") as pbar, _task_results(tasks, n_workers) as task_results:
+            current_n = None
+            experiments_in_current_n = 0
+            rows_written = 0
             start_time = time.time()
+            last_postfix_time = 0.0
             
-            try:
-                result = run_single_experiment(n, p, k, rep, base_seed, n_stretch_samples)
-                results.append(result)
-                
-                # Save result immediately if output path provided
-                if output_path:
-                    df_row = pd.DataFrame([result])
-                    df_row.to_csv(output_path, mode='a', header=False, index=False)
-            except Exception as e:
-                print(f"\nError in experiment n={n}, p={p}, k={k}, rep={rep}: {e}")
-                error_result = {'n': n, 'p': p, 'k': k, 'rep': rep, 'seed': base_seed + rep, 'error': str(e)}
-                results.append(error_result)
-                if output_path:
-                    df_row = pd.DataFrame([error_result])
-                    df_row.to_csv(output_path, mode='a', header=False, index=False)
-            
-            elapsed = time.time() - start_time
-            experiments_in_current_n += 1
-            
-            # Update average time for current n
-            total_time, count = n_avg_times[n]
-            n_avg_times[n] = (total_time + elapsed, count + 1)
-            current_avg_time = n_avg_times[n][0] / n_avg_times[n][1]
-            
-            # Time remaining for current n
-            remaining_in_current_n = experiments_per_n - experiments_in_current_n
-            remaining_time = current_avg_time * remaining_in_current_n
-            
-            # Time for remaining n values (using O(n^2) scaling)
-            # Chain estimates: each next n's estimate is based on the previous n's estimate
-            current_n_idx = n_values.index(n)
-            remaining_n_values = n_values[current_n_idx + 1:]
-            
-            if remaining_n_values:
-                # Start with current n's avg time as base for chaining
-                prev_estimated_avg_time = current_avg_time
-                prev_n_for_estimate = n
-                
-                for next_n in remaining_n_values:
-                    # Calculate ratio between consecutive n values
-                    ratio = next_n / prev_n_for_estimate
+            for (n, _, _, _, _, _), task_rows in zip(tasks, task_results):
+                # Detect when we move to a new n value
+                if n != current_n:
+                    current_n = n
+                    experiments_in_current_n = 0
+                    # Initialize with estimate from previous n if available
+                    if prev_n is not None and prev_avg_time is not None:
+                        # O(n^2) scaling: time scales as (n2/n1)^2
+                        ratio = n / prev_n
+                        estimated_avg_time = (prev_avg_time * ratio) ** 2
+                        n_avg_times[n] = (estimated_avg_time, 1)  # Initialize with estimate
+                    else:
+                        n_avg_times[n] = (0.0, 0)  # Will be updated after first experiment
                     
-                    # Update estimate based on previous estimate (chaining)
-                    # For O(n^2) scaling: time scales as (n2/n1)^2, so multiply by ratio^2
-                    # Correct formula: prev_time * (ratio^2), not (prev_time * ratio)^2
-                    estimated_avg_time_next = prev_estimated_avg_time * (ratio ** 2)
-                    remaining_time += estimated_avg_time_next * experiments_per_n
+                    # Time for remaining n values (using O(n^2) scaling), as a multiple of the
+                    # current n's average time. Chaining estimates through consecutive n values
+                    # telescopes: each later n costs avg_time * (next_n / n)^2 per experiment.
+                    remaining_n_values = n_values[n_index[n] + 1:]
+                    remaining_tail_factor = experiments_per_n * sum((next_n / n) ** 2 for next_n in remaining_n_values)
+                
+                for result in task_rows:
+                    if 'error' in result:
+                        print(f"\nError in experiment n={n}, p={result['p']}, k={result['k']}, rep={result['rep']}: {result['error']}")
+                        error_rows.append((rows_written, result['error']))
                     
-                    # Update for next iteration
-                    prev_estimated_avg_time = estimated_avg_time_next
-                    prev_n_for_estimate = next_n
-            
-            # Update progress bar with remaining time
-            if remaining_time > 0:
-                pbar.set_postfix({'est_remaining': f'{remaining_time:.0f}s'})
-            
-            pbar.update(1)
-            
-            # Update previous n info for next iteration
-            if experiments_in_current_n == experiments_per_n:
-                prev_n = n
-                prev_avg_time = current_avg_time
+                    # Save result as it arrives if output path provided, otherwise keep it in memory
+                    if writer is not None:
+                        writer.write(result)
+                    else:
+                        rows[rows_written] = tuple(result.get(field, 0) for field in RESULT_FIELDS)
+                    rows_written += 1
+                
+                # Wall-clock time between results, so estimates account for parallel workers
+                now = time.time()
+                elapsed = now - start_time
+                start_time = now
+                experiments_in_current_n += len(task_rows)
+                
+                # Update average time for current n
+                total_time, count = n_avg_times[n]
+                n_avg_times[n] = (total_time + elapsed, count + len(task_rows))
+                current_avg_time = n_avg_times[n][0] / n_avg_times[n][1]
+                
+                # Update progress bar with remaining time, at most once per second
+                # (for small n, formatting and refreshing the postfix costs as much as an experiment)
+                if now - last_postfix_time >= 1.0:
+                    # Time remaining for current n plus the remaining n values
+                    remaining_in_current_n = experiments_per_n - experiments_in_current_n
+                    remaining_time = current_avg_time * (remaining_in_current_n + remaining_tail_factor)
+                    if remaining_time > 0:
+                        pbar.set_postfix({'est_remaining': f'{remaining_time:.0f}s'}, refresh=False)
+                    last_postfix_time = now
+                
+                pbar.update(len(task_rows))
+                
+                # Update previous n info for next iteration
+                if experiments_in_current_n == experiments_per_n:
+                    prev_n = n
+                    prev_avg_time = current_avg_time
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    if writer is not None:
+        # Restore RESULT_DTYPE column types lost in the file round trip (e.g. i4 read back as
+        # int64), matching the in-memory frame; columns blanked by failed rows stay float
+        df = writer.read()
+        df = df.astype({field: RESULT_DTYPE[field] for field in RESULT_FIELDS if not df[field].isna().any()})
+    else:
+        df = pd.DataFrame(rows)
     
-    return pd.DataFrame(results)
+    if error_rows:
+        positions, messages = zip(*error_rows)
+        failed = np.zeros(len(df), dtype=bool)
+        failed[list(positions)] = True
+        if writer is None:
+            # Blank the metrics of failed rows, matching what reading the file back gives
+            for field in RESULT_FIELDS:
+                if field not in _PARAMETER_FIELDS:
+                    df[field] = df[field].mask(failed)
+        # Create the column first; enlarging via .loc would fill other rows with the string 'nan'
+        df['error'] = pd.Series(np.nan, index=df.index, dtype=object)
+        df.loc[failed, 'error'] = list(messages)
+    return df
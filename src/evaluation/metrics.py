@@ -1,5 +1,7 @@
 """Metrics and statistics utilities for experiment results."""
 
+from functools import lru_cache
+
 import pandas as pd
 
 
@@ -58,10 +60,13 @@ def aggregate_results(df: pd.DataFrame) -> pd.DataFrame:
     return aggregated
 
 
+@lru_cache(maxsize=None)
 def compute_theoretical_bound(n: int, k: int) -> float:
     """
     Compute theoretical bound O(k * n^(1+1/k)) for spanner size.
     
+    Results are memoized per (n, k); the suite asks for the same pairs once per rep.
+    
     Args:
         n: Number of vertices
         k: Spanner parameter
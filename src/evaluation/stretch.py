@@ -1,60 +1,186 @@
 """Stretch computation utilities for spanner evaluation."""
 
-from collections import deque
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
+from .._ckernels import bfs_all_pairs, bfs_bitparallel, bfs_multi, bfs_to_targets, component_roots
+from ..graphs.csr import CSRGraph, as_csr
+from ..graphs.erdos_renyi import pair_from_index
+from ..utils.seeding import RandomSeed
 
-def compute_distances_bfs(G: Dict[int, List[int]], source: int) -> Dict[int, int]:
+# Sources per BFS kernel call; bounds the (sources x n) distance matrix in memory.
+# A multiple of 64 so bit-parallel BFS groups are full.
+_BFS_BLOCK = 256
+
+
+def compute_distances_bfs(G: Union[CSRGraph, Dict[int, List[int]]], source: int) -> Dict[int, int]:
     """
     Compute distances from source to all reachable vertices using BFS.
     
     Args:
-        G: Graph as adjacency list
+        G: Graph as CSRGraph or adjacency list
         source: Source vertex
         
     Returns:
         Dictionary mapping vertex to distance from source
     """
-    distances = {source: 0}
-    queue = deque[int]([source])
+    G = as_csr(G)
+    # Single-source run of the ring-buffer BFS kernel
+    dist = bfs_multi(G.indptr, G.indices, np.array([source], dtype=np.int32), len(G))[0]
+    reachable = np.flatnonzero(dist >= 0)
+    
+    return dict(zip(reachable.tolist(), dist[reachable].tolist()))
+
+
+def _pair_distances(G: CSRGraph, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Compute d_G(sources[i], targets[i]) for every i with bit-parallel multi-source BFS.
     
-    while queue:
-        u = queue.popleft()
-        for v in G.get(u, []):
-            if v not in distances:
-                distances[v] = distances[u] + 1
-                queue.append(v)
+    Distinct sources are traversed 64 at a time in one pass (bfs_bitparallel), so
+    queries sharing a source, and sources sharing a group, share the edge scans.
+    Each distinct source is searched exactly once per call and its distance row is
+    kept only while its block of _BFS_BLOCK sources is answered, which bounds memory
+    to _BFS_BLOCK x n without caching across calls.
     
+    Returns:
+        int32 array of distances, -1 where the target is unreachable
+    """
+    unique_sources, source_rows = np.unique(sources, return_inverse=True)
+    distances = np.empty(len(sources), dtype=np.int32)
+    for start in range(0, len(unique_sources), _BFS_BLOCK):
+        block = unique_sources[start:start + _BFS_BLOCK]
+        dist = bfs_bitparallel(G.indptr, G.indices, block, len(G))
+        in_block = (source_rows >= start) & (source_rows < start + len(block))
+        distances[in_block] = dist[source_rows[in_block] - start, targets[in_block]]
     return distances
 
 
-def compute_all_pairs_distances(G: Dict[int, List[int]]) -> Dict[Tuple[int, int], int]:
+def _target_distances(G: CSRGraph, sources: np.ndarray, targets: np.ndarray, cutoff: Optional[int] = None) -> np.ndarray:
     """
-    Compute all-pairs shortest distances in a graph.
+    Compute d_G(sources[i], targets[i]) with one BFS per query that stops at its target.
+    
+    Cheaper than _pair_distances when targets are close to their sources (e.g. the
+    endpoints of a sampled edge in a spanner). With several queries, components of G
+    are labeled first so that queries across components are answered without a
+    search, which would otherwise exhaust the source's whole component.
+    
+    Returns:
+        int32 array of distances, -1 where the target is unreachable (or beyond cutoff)
+    """
+    cutoff = len(G) if cutoff is None else cutoff
+    sources = np.ascontiguousarray(sources, dtype=np.int32)
+    targets = np.ascontiguousarray(targets, dtype=np.int32)
+    if len(sources) <= 1:
+        return bfs_to_targets(G.indptr, G.indices, sources, targets, len(G), cutoff)
+    
+    # One union-find pass over G, then BFS only for queries within a component
+    roots = component_roots(G.indptr, G.indices, len(G))
+    connected = roots[sources] == roots[targets]
+    distances = np.full(len(sources), -1, dtype=np.int32)
+    distances[connected] = bfs_to_targets(G.indptr, G.indices, sources[connected], targets[connected], len(G), cutoff)
+    return distances
+
+
+def bfs_single_target(G: Union[CSRGraph, Dict[int, List[int]]], source: int, target: int, cutoff: Optional[int] = None) -> float:
+    """
+    BFS distance from source to target, stopping as soon as target is found.
     
     Args:
-        G: Graph as adjacency list
+        G: Graph as CSRGraph or adjacency list
+        source: Source vertex
+        target: Target vertex
+        cutoff: Give up beyond this distance (default: no limit)
         
     Returns:
-        Dictionary mapping (u, v) pairs to distance (only u < v to avoid duplicates)
+        d_G(source, target), or float('inf') if unreachable (within cutoff)
     """
-    all_distances = {}
-    n = len(G)
+    dist = _target_distances(as_csr(G), [source], [target], cutoff)[0]
+    return float(dist) if dist >= 0 else float('inf')
+
+
+def _sample_edges(G: CSRGraph, n_samples: int, rng: np.random.Generator) -> np.ndarray:
+    """Sample up to n_samples distinct edges (u, v), u < v."""
+    src = np.repeat(np.arange(len(G), dtype=np.int32), G.degrees())
+    is_upper = src < G.indices
+    edges = np.stack([src[is_upper], G.indices[is_upper]], axis=1)
+    n_samples = min(n_samples, len(edges))
+    return edges[rng.choice(len(edges), size=n_samples, replace=False)]
+
+
+def _sample_pairs(n: int, n_samples: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw n_samples distinct-vertex pairs uniformly; rows are (u, v) with u < v."""
+    # Draw pair indices directly, so no self-pairs need rejecting
+    v, u = pair_from_index(rng.integers(0, n * (n - 1) // 2, size=n_samples))
+    return np.stack([u, v], axis=1).astype(np.int32)
+
+
+def _edge_stretch_summary(dists_H: np.ndarray) -> Dict:
+    """Stretch statistics for sampled edges given their distances in H (-1 = unreachable)."""
+    dists_H = np.asarray(dists_H)
+    if dists_H.size == 0:
+        return {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_edges': 0, 'n_infinite': 0}
+    
+    # Distance in G is 1 (it's an edge); unreachable in H - infinite stretch
+    reachable = dists_H >= 0
+    stretches = np.where(reachable, dists_H, np.inf).astype(np.float64)
+    
+    # Average over finite stretches only
+    finite_stretches = stretches[reachable]
+    avg_stretch = float(finite_stretches.mean()) if finite_stretches.size else 0.0
+    
+    return {'max_stretch': float(stretches.max()), 'avg_stretch': avg_stretch, 'stretches': stretches.tolist(), 'n_edges': len(stretches), 'n_infinite': len(stretches) - len(finite_stretches)}
+
+
+def _pair_stretch_summary(dists_G: np.ndarray, dists_H: np.ndarray) -> Dict:
+    """Stretch statistics for sampled pairs given their distances in G and H (-1 = unreachable)."""
+    # Pairs unreachable in G are skipped
+    connected = np.asarray(dists_G) > 0
+    dists_G = np.asarray(dists_G)[connected]
+    dists_H = np.asarray(dists_H)[connected]
+    
+    if dists_G.size == 0:
+        return {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_pairs': 0}
     
-    for source in range(n):
-        distances = compute_distances_bfs(G, source)
-        for target, dist in distances.items():
-            if source < target:
-                all_distances[(source, target)] = dist
-            elif target < source:
-                all_distances[(target, source)] = dist
+    # Unreachable in H - infinite stretch
+    reachable = dists_H >= 0
+    stretches = np.full(len(dists_G), np.inf)
+    stretches[reachable] = dists_H[reachable] / dists_G[reachable]
     
-    return all_distances
+    # Average over finite stretches only
+    finite_stretches = stretches[reachable]
+    avg_stretch = float(finite_stretches.mean()) if finite_stretches.size else 0.0
+    
+    return {
+        'max_stretch': float(stretches.max()),
+        'avg_stretch': avg_stretch,
+        'stretches': stretches.tolist(),
+        'n_pairs': len(stretches),
+        'n_infinite': len(stretches) - len(finite_stretches)
+    }
 
 
-def compute_stretch_edges(G: Dict[int, List[int]], H: Dict[int, List[int]]) -> Dict:
+def compute_all_pairs_distances(G: Union[CSRGraph, Dict[int, List[int]]]) -> np.ndarray:
+    """
+    Compute all-pairs shortest distances in a graph.
+    
+    Args:
+        G: Graph as CSRGraph or adjacency list
+        
+    Returns:
+        Dense (n, n) distance matrix, uint16 (int32 if n >= 65535); unreachable pairs
+        hold the dtype's maximum value, np.iinfo(dist.dtype).max
+    """
+    G = as_csr(G)
+    n = len(G)
+    dtype = np.uint16 if n < np.iinfo(np.uint16).max else np.int32
+    unreachable = np.iinfo(dtype).max
+    dist = np.full((n, n), unreachable, dtype=dtype)
+    bfs_all_pairs(G.indptr, G.indices, dist, unreachable)
+    return dist
+
+
+def compute_stretch_edges(G: Union[CSRGraph, Dict[int, List[int]]], H: Union[CSRGraph, Dict[int, List[int]]]) -> Dict:
     """
     Compute stretch for all edges in G.
     
@@ -71,52 +197,21 @@ def compute_stretch_edges(G: Dict[int, List[int]], H: Dict[int, List[int]]) -> D
         - 'stretches': List of all stretch values
         - 'n_edges': Number of edges processed
     """
-    stretches = []
+    G = as_csr(G)
     
     # Compute distances in H
     dist_H = compute_all_pairs_distances(H)
     
-    # For each edge (u,v) in G
-    for u in G:
-        for v in G.get(u, []):
-            if u < v:  # Process each edge once
-                # Distance in G is 1 (it's an edge)
-                d_G = 1
-                
-                # Distance in H
-                if (u, v) in dist_H:
-                    d_H = dist_H[(u, v)]
-                elif u == v:
-                    d_H = 0
-                else:
-                    # Check if reachable in H
-                    dists_from_u = compute_distances_bfs(H, u)
-                    if v in dists_from_u:
-                        d_H = dists_from_u[v]
-                    else:
-                        # Unreachable - infinite stretch
-                        d_H = float('inf')
-                
-                if d_H == float('inf'):
-                    stretch = float('inf')
-                else:
-                    stretch = d_H / d_G if d_G > 0 else float('inf')
-                
-                stretches.append(stretch)
-    
-    if not stretches:
-        return {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_edges': 0}
-    
-    # Filter out infinite stretches for average calculation
-    finite_stretches = [s for s in stretches if s != float('inf')]
-    
-    max_stretch = max(stretches) if stretches else 0.0
-    avg_stretch = sum(finite_stretches) / len(finite_stretches) if finite_stretches else 0.0
-    
-    return {'max_stretch': max_stretch if max_stretch != float('inf') else float('inf'), 'avg_stretch': avg_stretch, 'stretches': stretches, 'n_edges': len(stretches), 'n_infinite': len(stretches) - len(finite_stretches)}
+    # Each edge (u,v) of G once (u < v); its distance in G is 1
+    src = np.repeat(np.arange(len(G), dtype=np.int32), G.degrees())
+    is_upper = src < G.indices
+    dists_H = dist_H[src[is_upper], G.indices[is_upper]].astype(np.int32)
+    dists_H[dists_H == np.iinfo(dist_H.dtype).max] = -1
+    
+    return _edge_stretch_summary(dists_H)
 
 
-def compute_stretch_sampled_edges(G: Dict[int, List[int]], H: Dict[int, List[int]], n_samples: int, seed: int = None) -> Dict:
+def compute_stretch_sampled_edges(G: Union[CSRGraph, Dict[int, List[int]]], H: Union[CSRGraph, Dict[int, List[int]]], n_samples: int, seed: RandomSeed = None) -> Dict:
     """
     Compute stretch for a sample of edges in G.
     
@@ -127,7 +222,7 @@ def compute_stretch_sampled_edges(G: Dict[int, List[int]], H: Dict[int, List[int
         G: Original graph
         H: Spanner graph
         n_samples: Number of edges to sample
-        seed: Random seed for sampling
+        seed: Random seed or Generator for sampling
         
     Returns:
         Dictionary with keys:
@@ -136,62 +231,21 @@ def compute_stretch_sampled_edges(G: Dict[int, List[int]], H: Dict[int, List[int
         - 'stretches': List of stretch values
         - 'n_edges': Number of edges processed
     """
-    if seed is not None:
-        np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     n = len(G)
     if n < 2:
         return {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_edges': 0, 'n_infinite': 0}
     
-    # Collect all edges in G
-    edges = []
-    for u in G:
-        for v in G.get(u, []):
-            if u < v:  # Process each edge once
-                edges.append((u, v))
-    
-    if not edges:
-        return {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_edges': 0, 'n_infinite': 0}
-    
-    # Sample edges
-    n_samples = min(n_samples, len(edges))
-    sampled_edges = [edges[i] for i in np.random.choice(len(edges), size=n_samples, replace=False)]
-    
-    stretches = []
-    
-    # For each sampled edge (u,v) in G
-    for u, v in sampled_edges:
-        # Distance in G is 1 (it's an edge)
-        d_G = 1
-        
-        # Compute distance in H using targeted BFS
-        dists_H = compute_distances_bfs(H, u)
-        if v not in dists_H:
-            # Unreachable in H - infinite stretch
-            d_H = float('inf')
-        else:
-            d_H = dists_H[v]
-        
-        if d_H == float('inf'):
-            stretch = float('inf')
-        else:
-            stretch = d_H / d_G if d_G > 0 else float('inf')
-        
-        stretches.append(stretch)
-    
-    if not stretches:
-        return {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_edges': 0, 'n_infinite': 0}
-    
-    # Filter out infinite stretches for average calculation
-    finite_stretches = [s for s in stretches if s != float('inf')]
-    
-    max_stretch = max(stretches) if stretches else 0.0
-    avg_stretch = sum(finite_stretches) / len(finite_stretches) if finite_stretches else 0.0
+    # Sample edges, then take their distances in H; endpoints of an edge are close
+    # in a spanner, so each BFS stops early at its target
+    sampled_edges = _sample_edges(as_csr(G), n_samples, rng)
+    dists_H = _target_distances(as_csr(H), sampled_edges[:, 0], sampled_edges[:, 1])
     
-    return {'max_stretch': max_stretch if max_stretch != float('inf') else float('inf'), 'avg_stretch': avg_stretch, 'stretches': stretches, 'n_edges': len(stretches), 'n_infinite': len(stretches) - len(finite_stretches)}
+    return _edge_stretch_summary(dists_H)
 
 
-def compute_stretch_sampled_pairs(G: Dict[int, List[int]], H: Dict[int, List[int]], n_samples: int, seed: int = None) -> Dict:
+def compute_stretch_sampled_pairs(G: Union[CSRGraph, Dict[int, List[int]]], H: Union[CSRGraph, Dict[int, List[int]]], n_samples: int, seed: RandomSeed = None) -> Dict:
     """
     Compute stretch for a sample of vertex pairs.
     
@@ -199,7 +253,7 @@ def compute_stretch_sampled_pairs(G: Dict[int, List[int]], H: Dict[int, List[int
         G: Original graph
         H: Spanner graph
         n_samples: Number of vertex pairs to sample
-        seed: Random seed for sampling
+        seed: Random seed or Generator for sampling
         
     Returns:
         Dictionary with keys:
@@ -208,63 +262,55 @@ def compute_stretch_sampled_pairs(G: Dict[int, List[int]], H: Dict[int, List[int
         - 'stretches': List of stretch values
         - 'n_pairs': Number of pairs processed
     """
-    if seed is not None:
-        np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     n = len(G)
     if n < 2:
         return {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_pairs': 0}
     
-    stretches = []
+    # Distances in G and H from all sampled sources, one batched BFS per graph
+    pairs = _sample_pairs(n, n_samples, rng)
+    dists_G = _pair_distances(as_csr(G), pairs[:, 0], pairs[:, 1])
+    dists_H = _pair_distances(as_csr(H), pairs[:, 0], pairs[:, 1])
     
-    # Sample pairs
-    for _ in range(n_samples):
-        u = np.random.randint(0, n)
-        v = np.random.randint(0, n)
-        
-        # Skip self-loops
-        if u == v:
-            continue
-        
-        # Ensure u < v for consistency
-        if u > v:
-            u, v = v, u
-        
-        # Compute distance in G
-        dists_G = compute_distances_bfs(G, u)
-        if v not in dists_G:
-            # Unreachable in G - skip
-            continue
-        d_G = dists_G[v]
-        
-        if d_G == 0:
-            continue
-        
-        # Compute distance in H
-        dists_H = compute_distances_bfs(H, u)
-        if v not in dists_H:
-            # Unreachable in H - infinite stretch
-            stretch = float('inf')
-        else:
-            d_H = dists_H[v]
-            stretch = d_H / d_G if d_G > 0 else float('inf')
+    return _pair_stretch_summary(dists_G, dists_H)
+
+
+def compute_stretch_both(G: Union[CSRGraph, Dict[int, List[int]]], H: Union[CSRGraph, Dict[int, List[int]]], n_samples: int, seed: RandomSeed = None) -> Tuple[Dict, Dict]:
+    """
+    Compute sampled-edge and sampled-pair stretch together.
+    
+    Edges and then pairs are sampled from one generator. Edge distances in H use
+    early-exit BFS per edge; pair distances in G and H use batched BFS.
+    
+    Args:
+        G: Original graph
+        H: Spanner graph
+        n_samples: Number of edges and of vertex pairs to sample
+        seed: Random seed or Generator for sampling
         
-        stretches.append(stretch)
+    Returns:
+        Tuple of (edge stretch dict, pair stretch dict) in the formats of
+        compute_stretch_sampled_edges and compute_stretch_sampled_pairs
+    """
+    n = len(G)
+    if n < 2:
+        return (
+            {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_edges': 0, 'n_infinite': 0},
+            {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_pairs': 0}
+        )
     
-    if not stretches:
-        return {'max_stretch': 0.0, 'avg_stretch': 0.0, 'stretches': [], 'n_pairs': 0}
+    G = as_csr(G)
+    H = as_csr(H)
     
-    # Filter out infinite stretches for average
-    finite_stretches = [s for s in stretches if s != float('inf')]
+    rng = np.random.default_rng(seed)
+    sampled_edges = _sample_edges(G, n_samples, rng)
+    pairs = _sample_pairs(n, n_samples, rng)
     
-    max_stretch = max(stretches) if stretches else 0.0
-    avg_stretch = sum(finite_stretches) / len(finite_stretches) if finite_stretches else 0.0
+    # Edge endpoints are close in H, so their searches stop early; random pairs are
+    # typically far apart, where full batched BFS from shared sources is cheaper
+    dists_H_edges = _target_distances(H, sampled_edges[:, 0], sampled_edges[:, 1])
+    dists_H_pairs = _pair_distances(H, pairs[:, 0], pairs[:, 1])
+    dists_G = _pair_distances(G, pairs[:, 0], pairs[:, 1])
     
-    return {
-        'max_stretch': max_stretch if max_stretch != float('inf') else float('inf'),
-        'avg_stretch': avg_stretch,
-        'stretches': stretches,
-        'n_pairs': len(stretches),
-        'n_infinite': len(stretches) - len(finite_stretches)
-    }
-
+    return _edge_stretch_summary(dists_H_edges), _pair_stretch_summary(dists_G, dists_H_pairs)
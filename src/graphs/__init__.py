@@ -1,6 +1,6 @@
 """Graph generation utilities."""
 
+from .csr import CSRGraph, as_csr, neighbors
 from .erdos_renyi import generate_erdos_renyi_graph
 
-__all__ = ['generate_erdos_renyi_graph']
-
+__all__ = ['CSRGraph', 'as_csr', 'neighbors', 'generate_erdos_renyi_graph']
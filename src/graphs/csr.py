@@ -0,0 +1,126 @@
+"""Compressed sparse row (CSR) graph representation."""
+
+import array
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Union
+
+import numpy as np
+
+
+def _index_dtype(size: int) -> type:
+    """Smallest integer dtype able to hold offsets up to size."""
+    return np.int32 if size < np.iinfo(np.int32).max else np.int64
+
+
+class CSRGraph(Mapping):
+    """
+    Undirected graph stored as CSR arrays.
+
+    The neighbors of vertex v are ``indices[indptr[v]:indptr[v + 1]]`` (sorted
+    ascending), and every undirected edge appears once in each endpoint's row.
+    The class is also a read-only ``Mapping`` from vertex to neighbor array, so
+    code written against ``{vertex: [neighbors]}`` dicts keeps working.
+
+    Attributes:
+        indptr: Row offsets, shape (n + 1,)
+        indices: Concatenated neighbor lists, shape (2m,), int32
+    """
+
+    __slots__ = ('indptr', 'indices')
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray):
+        self.indptr = np.asarray(indptr, dtype=_index_dtype(int(indptr[-1])))
+        self.indices = np.asarray(indices, dtype=np.int32)
+
+    @classmethod
+    def from_edges(cls, n: int, src: np.ndarray, dst: np.ndarray) -> 'CSRGraph':
+        """
+        Build a graph on vertices 0..n-1 from undirected edges (src[i], dst[i]).
+
+        Each edge must be listed once; the reverse direction is added here.
+        """
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        heads = np.concatenate([src, dst])
+        tails = np.concatenate([dst, src])
+        order = np.lexsort((tails, heads))
+
+        degrees = np.bincount(heads, minlength=n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        return cls(indptr, tails[order])
+
+    @classmethod
+    def from_dict(cls, graph: Dict[int, List[int]]) -> 'CSRGraph':
+        """Build a graph from an adjacency dict with vertices 0..n-1."""
+        n = len(graph)
+        # Packed 4-byte ints instead of lists of int objects; NumPy reads them zero-copy
+        src = array.array('i')
+        dst = array.array('i')
+        for u in range(n):
+            for v in graph[u]:
+                if u < v:
+                    src.append(u)
+                    dst.append(v)
+        return cls.from_edges(n, src, dst)
+
+    @property
+    def n_edges(self) -> int:
+        """Number of undirected edges."""
+        return int(self.indptr[-1]) // 2
+
+    def degrees(self) -> np.ndarray:
+        """Degree of every vertex."""
+        return np.diff(self.indptr)
+
+    def subgraph(self, vertices: np.ndarray) -> 'CSRGraph':
+        """Induced subgraph on vertices, relabeled so that vertices[i] becomes i."""
+        vertices = np.asarray(vertices, dtype=np.int64)
+        label = np.full(len(self), -1, dtype=np.int64)
+        label[vertices] = np.arange(len(vertices))
+
+        src = np.repeat(np.arange(len(self)), self.degrees())
+        keep = (src < self.indices) & (label[src] >= 0) & (label[self.indices] >= 0)
+        return CSRGraph.from_edges(len(vertices), label[src[keep]], label[self.indices[keep]])
+
+    def to_dict(self) -> Dict[int, List[int]]:
+        """Convert to an adjacency dict {vertex: [neighbors]} of Python ints."""
+        return {v: self.indices[self.indptr[v]:self.indptr[v + 1]].tolist() for v in range(len(self))}
+
+    def __getitem__(self, v: int) -> np.ndarray:
+        if v not in self:
+            raise KeyError(v)
+        return self.indices[self.indptr[v]:self.indptr[v + 1]]
+
+    def __contains__(self, v: object) -> bool:
+        return isinstance(v, (int, np.integer)) and 0 <= v < len(self)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def __eq__(self, other: object) -> bool:
+        # Mapping.__eq__ would compare neighbor arrays elementwise and fail on truthiness
+        if not isinstance(other, CSRGraph):
+            return NotImplemented
+        return np.array_equal(self.indptr, other.indptr) and np.array_equal(self.indices, other.indices)
+
+    # Mutable arrays inside; equal graphs could not promise equal hashes
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CSRGraph(n={len(self)}, m={self.n_edges})"
+
+
+def neighbors(G: CSRGraph, v: int) -> np.ndarray:
+    """Neighbors of v as an ndarray view into G.indices."""
+    return G.indices[G.indptr[v]:G.indptr[v + 1]]
+
+
+def as_csr(G: Union[CSRGraph, Dict[int, List[int]]]) -> CSRGraph:
+    """Return G as a CSRGraph, converting adjacency dicts."""
+    if isinstance(G, CSRGraph):
+        return G
+    return CSRGraph.from_dict(G)
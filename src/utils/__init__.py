@@ -1,7 +1,7 @@
 """Utility functions."""
 
-from .seeding import set_seed
+from .seeding import RandomSeed, set_seed
 from .timing import Timer, timed
 
-__all__ = ['set_seed', 'Timer', 'timed']
+__all__ = ['RandomSeed', 'set_seed', 'Timer', 'timed']
 
@@ -1,8 +1,14 @@
 """Random seeding utilities for reproducibility."""
 
 import random
+from typing import Optional, Union
+
 import numpy as np
 
+# Anything np.random.default_rng accepts: an int seed, a SeedSequence (e.g. one of the
+# children from SeedSequence(seed).spawn(k)), an existing Generator, or None for fresh entropy
+RandomSeed = Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+
 
 def set_seed(seed: int) -> None:
     """
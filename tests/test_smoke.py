@@ -3,6 +3,8 @@
 import sys
 from pathlib import Path
 
+import numpy as np
+
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
@@ -28,3 +30,159 @@ def test_baswana_sen_small_graph():
     spanner = build_spanner_baswana_sen(graph, k=2, seed=42)
     assert len(spanner) == 3
     assert all(u in spanner for u in graph)
+
+
+def test_bfs_multi_path_graph():
+    from src._ckernels import bfs_multi
+    from src.graphs.csr import CSRGraph
+
+    # Path 0-1-2-3 plus isolated vertex 4
+    G = CSRGraph.from_edges(5, [0, 1, 2], [1, 2, 3])
+    dist = bfs_multi(G.indptr, G.indices, np.array([0, 2], dtype=np.int32), len(G))
+    assert dist.tolist() == [[0, 1, 2, 3, -1], [2, 1, 0, 1, -1]]
+
+
+def test_all_pairs_distances_path_graph():
+    from src.evaluation.stretch import compute_all_pairs_distances
+    from src.graphs.csr import CSRGraph
+
+    # Path 0-1-2 plus isolated vertex 3
+    dist = compute_all_pairs_distances(CSRGraph.from_edges(4, [0, 1], [1, 2]))
+    inf = np.iinfo(dist.dtype).max
+    assert dist.tolist() == [[0, 1, 2, inf], [1, 0, 1, inf], [2, 1, 0, inf], [inf, inf, inf, 0]]
+
+
+def test_bfs_bitparallel_matches_bfs_multi():
+    from src._ckernels import bfs_bitparallel, bfs_multi
+    from src.graphs.erdos_renyi import generate_erdos_renyi_graph
+
+    G, _, _ = generate_erdos_renyi_graph(150, 0.03, seed=0)
+    # 70 sources span two 64-bit groups; repeats share a group
+    sources = np.random.default_rng(0).integers(0, len(G), size=70).astype(np.int32)
+    expected = bfs_multi(G.indptr, G.indices, sources, len(G))
+    assert np.array_equal(bfs_bitparallel(G.indptr, G.indices, sources, len(G)), expected)
+
+
+def test_bfs_single_target_cutoff():
+    from src.evaluation.stretch import bfs_single_target
+    from src.graphs.csr import CSRGraph
+
+    # Path 0-1-2-3 plus isolated vertex 4
+    G = CSRGraph.from_edges(5, [0, 1, 2], [1, 2, 3])
+    assert bfs_single_target(G, 0, 3) == 3
+    assert bfs_single_target(G, 0, 3, cutoff=2) == float('inf')
+    assert bfs_single_target(G, 0, 4) == float('inf')
+    assert bfs_single_target(G, 2, 2) == 0
+
+
+def test_suite_failure_only_affects_its_k(monkeypatch, tmp_path):
+    from src.evaluation import experiments
+
+    build = experiments.build_spanner_baswana_sen
+
+    def failing_build(G, k, seed):
+        if k == 3:
+            raise RuntimeError('boom')
+        return build(G, k, seed)
+
+    monkeypatch.setattr(experiments, 'build_spanner_baswana_sen', failing_build)
+    frames = []
+    for output_path in [None, str(tmp_path / 'results.csv')]:
+        df = experiments.run_experiment_suite([150], [0.05], [2, 3], n_reps=2, base_seed=0, n_stretch_samples=20, output_path=output_path, n_workers=1)
+        assert df['k'].tolist() == [2, 3, 2, 3]
+        assert df['error'].isna().tolist() == [True, False, True, False]
+        assert (df.loc[df['k'] == 3, 'error'] == 'boom').all()
+        assert df.loc[df['k'] == 2, 'spanner_size'].gt(0).all()
+        frames.append(df)
+    assert frames[0].dtypes.to_dict() == frames[1].dtypes.to_dict()
+
+
+def test_suite_file_and_memory_paths_match(tmp_path):
+    from src.evaluation.experiments import run_experiment_suite
+
+    in_memory = run_experiment_suite([150], [0.05], [2, 3], n_reps=2, base_seed=0, n_stretch_samples=20, n_workers=1)
+    from_file = run_experiment_suite([150], [0.05], [2, 3], n_reps=2, base_seed=0, n_stretch_samples=20, output_path=str(tmp_path / 'results.csv'), n_workers=1)
+    assert in_memory.dtypes.to_dict() == from_file.dtypes.to_dict()
+    columns = [c for c in in_memory.columns if not c.startswith('time_')]
+    assert in_memory[columns].equals(from_file[columns])
+
+
+def test_csr_graph_equality():
+    from src.graphs.csr import CSRGraph
+
+    G = CSRGraph.from_edges(3, [0, 1], [1, 2])
+    assert G == CSRGraph.from_dict({0: [1], 1: [2, 0], 2: [1]})
+    assert G != CSRGraph.from_edges(3, [0], [1])
+
+
+def test_greedy_spanner_stretch_bound():
+    from src.evaluation.stretch import compute_all_pairs_distances
+    from src.graphs.erdos_renyi import generate_erdos_renyi_graph
+    from src.spanners.greedy import build_greedy_spanner
+
+    G, _, _ = generate_erdos_renyi_graph(120, 0.1, seed=1)
+    src = np.repeat(np.arange(len(G)), G.degrees())
+    for k in [2, 3]:
+        H = build_greedy_spanner(G, k)
+        dist_H = compute_all_pairs_distances(H)
+        assert H.n_edges < G.n_edges
+        # H is a subgraph of G, and every edge of G is stretched by at most 2k-1
+        assert all(set(H[v].tolist()) <= set(G[v].tolist()) for v in H)
+        assert dist_H[src, G.indices].max() <= 2 * k - 1
+
+
+def test_component_roots_smallest_reachable_vertex():
+    from src._ckernels import bfs_multi, component_roots
+    from src.graphs.csr import CSRGraph
+
+    # Sparse random graph: many components, including isolated vertices
+    rng = np.random.default_rng(0)
+    src, dst = rng.integers(0, 200, size=(2, 120))
+    keep = src < dst
+    G = CSRGraph.from_edges(200, src[keep], dst[keep])
+    dist = bfs_multi(G.indptr, G.indices, np.arange(len(G), dtype=np.int32), len(G))
+    expected = (dist >= 0).argmax(axis=1)
+    assert component_roots(G.indptr, G.indices, len(G)).tolist() == expected.tolist()
+
+
+def test_pair_from_index_inverts_row_order():
+    from src.graphs.erdos_renyi import _sample_edges_geometric, pair_from_index
+
+    # All pairs of 50 vertices, plus indices large enough for float rounding to matter
+    index = np.concatenate([np.arange(50 * 49 // 2), 2 ** 52 + np.arange(-5, 5)])
+    v, w = pair_from_index(index)
+    assert ((0 <= w) & (w < v)).all()
+    assert np.array_equal(v * (v - 1) // 2 + w, index)
+
+    v, w = _sample_edges_geometric(300, 0.05, np.random.default_rng(0))
+    index = v * (v - 1) // 2 + w
+    assert ((0 <= w) & (w < v) & (v < 300)).all()
+    # Strictly increasing pair indices: no edge is drawn twice
+    assert (np.diff(index) > 0).all()
+
+
+def test_baswana_sen_phase_tie_break():
+    from src._ckernels import baswana_sen_phase
+    from src.graphs.csr import CSRGraph
+
+    # Path 0-1-2-3 in singleton clusters; sampling 0 and 2 leaves 1 adjacent to both
+    G = CSRGraph.from_edges(4, [0, 1, 2], [1, 2, 3])
+    edge_u = np.array([0, 1, 2])
+    edge_v = np.array([1, 2, 3])
+    in_spanner = np.zeros(3, dtype=bool)
+    sampled = np.array([True, False, True, False])
+    member_ptr, members, cluster_of = baswana_sen_phase(
+        G.indptr, G.indices, np.arange(5), np.arange(4), np.arange(4), sampled, np.array([0, 2]), edge_u, edge_v, in_spanner
+    )
+    # Vertex 1 joins both new clusters and is labeled by the higher one (1)
+    assert member_ptr.tolist() == [0, 2, 5]
+    assert members.tolist() == [0, 1, 2, 1, 3]
+    assert cluster_of.tolist() == [0, 1, 1, 1]
+    assert in_spanner.tolist() == [True, False, False]
+
+
+def test_warm_up_compiles_kernels():
+    from src import _ckernels
+
+    # Every kernel is called once; a dtype mismatch would raise under Numba
+    _ckernels.warm_up()